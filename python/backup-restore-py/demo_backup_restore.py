@@ -15,19 +15,63 @@ Usage:
 """
 
 import argparse
-import json
+import asyncio
+import atexit
+import logging
+import queue
 import subprocess
 import sys
+import threading
 import time
-from typing import List, Dict, Any
+from itertools import count
+from typing import List
 from confluent_kafka import Producer, Consumer, KafkaError
 
+import msgspec
+
 # Configuration
 TOPIC = "orders"
 BACKUP_ID = "python-backup"
 BACKUP_PATH = "s3://kafka-backups/python-demo"
 NUM_MESSAGES = 50
 
+# Long-lived helper containers (see start_tool_containers)
+KAFKA_CLI_CONTAINER = "python-demo-kafka-cli"
+KAFKA_BACKUP_CONTAINER = "python-demo-kafka-backup"
+
+# Per-message output goes through logging rather than print: the lazy
+# %-style arguments mean no string is built at all when the level is off,
+# which matters inside the delivery callback and the consume loop.
+log = logging.getLogger("demo")
+
+
+class Order(msgspec.Struct, frozen=True):
+    """Test order message.
+
+    A fixed-shape msgspec.Struct lets msgspec generate a type-specialized
+    JSON codec on first use, which is faster than encoding/decoding dicts.
+    Structs use a slotted layout (no per-instance __dict__), so a batch of
+    orders is several times smaller in memory than the equivalent dicts;
+    frozen=True also makes instances hashable and safe to share across the
+    decode worker threads.
+    """
+    order_id: str
+    customer_id: str
+    product: str
+    amount: float
+    timestamp: str
+
+
+class OrderSubset(msgspec.Struct, frozen=True):
+    """The two fields the verification step actually compares.
+
+    msgspec skips fields missing from the struct without allocating, so
+    decoding restored messages into this subset avoids parsing the rest
+    of the payload.
+    """
+    order_id: str
+    amount: float
+
 
 def print_step(step: int, message: str):
     """Print a formatted step message."""
@@ -55,43 +99,91 @@ def create_producer(bootstrap_servers: str) -> Producer:
 
 
 def create_consumer(bootstrap_servers: str, group_id: str) -> Consumer:
-    """Create a Kafka consumer."""
+    """Create a Kafka consumer tuned for one-shot bulk consumption.
+
+    The verify step reads the whole topic exactly once, so larger fetch
+    sizes trade a little latency for far fewer broker round-trips, and
+    auto-commit is off since the group's offsets are never reused.
+    """
     return Consumer({
         'bootstrap.servers': bootstrap_servers,
         'group.id': group_id,
         'auto.offset.reset': 'earliest',
-        'enable.auto.commit': True
+        'enable.auto.commit': False,
+        'fetch.min.bytes': 1 << 20,
+        'fetch.max.bytes': 50 << 20,
+        'fetch.wait.max.ms': 100,
+        'queued.max.messages.kbytes': 100000
     })
 
 
-def produce_messages(producer: Producer, messages: List[Dict[str, Any]]) -> None:
+def produce_messages(producer: Producer, messages: List[Order]) -> None:
     """Produce messages to Kafka topic."""
-    delivered = 0
+    # itertools.count advances in C; binding __next__ keeps the delivery
+    # callback free of the cell store a `nonlocal` counter would need.
+    delivered_counter = count()
+    count_delivery = delivered_counter.__next__
 
     def delivery_callback(err, msg):
-        nonlocal delivered
         if err:
-            print_error(f"Delivery failed: {err}")
+            log.error("✗ Delivery failed: %s", err)
         else:
-            delivered += 1
-
-    for msg in messages:
+            count_delivery()
+
+    # One encoder for the whole batch: msgspec reuses its internal buffer
+    # across encode() calls instead of allocating per message.
+    encoder = msgspec.json.Encoder()
+    # Delivery callbacks only fire during poll()/flush(); a non-blocking
+    # poll every POLL_INTERVAL messages drains the internal queue while we
+    # are still enqueueing instead of in one burst at the final flush.
+    POLL_INTERVAL = 1000
+    for i, msg in enumerate(messages):
         producer.produce(
             TOPIC,
-            key=msg['order_id'],
-            value=json.dumps(msg),
+            key=msg.order_id,
+            value=encoder.encode(msg),
             callback=delivery_callback
         )
+        if i % POLL_INTERVAL == 0:
+            producer.poll(0)
 
     # Wait for all messages to be delivered
     producer.flush(timeout=30)
+    delivered = next(delivered_counter)
     print_success(f"Produced {delivered} messages to '{TOPIC}'")
 
 
-def consume_messages(consumer: Consumer, timeout: float = 30.0) -> List[Dict[str, Any]]:
-    """Consume all messages from the topic."""
+def consume_messages(consumer: Consumer, timeout: float = 30.0) -> List[OrderSubset]:
+    """Consume all messages from the topic.
+
+    Raw payload bytes go onto a bounded queue and are decoded by two
+    worker threads; msgspec releases the GIL during decode, so parsing
+    overlaps broker fetches instead of competing with them on the thread
+    that calls into librdkafka.
+    """
     consumer.subscribe([TOPIC])
+    raw_payloads = queue.Queue(maxsize=1000)
     messages = []
+    messages_lock = threading.Lock()
+
+    def decode_worker():
+        decoder = msgspec.json.Decoder(OrderSubset)
+        while True:
+            payload = raw_payloads.get()
+            if payload is None:
+                break
+            try:
+                value = decoder.decode(payload)
+            except msgspec.DecodeError:
+                log.warning("  Warning: Could not parse message as JSON")
+                continue
+            with messages_lock:
+                messages.append(value)
+
+    workers = [threading.Thread(target=decode_worker) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+
     start_time = time.time()
     empty_polls = 0
     max_empty_polls = 10
@@ -101,59 +193,119 @@ def consume_messages(consumer: Consumer, timeout: float = 30.0) -> List[Dict[str
             print(f"  Timeout reached after {timeout}s")
             break
 
-        msg = consumer.poll(1.0)
+        # consume() returns a whole batch per Python/C crossing instead of
+        # one message per poll(), amortizing the GIL handoff for large N.
+        batch = consumer.consume(num_messages=500, timeout=1.0)
 
-        if msg is None:
+        if not batch:
             empty_polls += 1
             continue
 
-        if msg.error():
-            if msg.error().code() == KafkaError._PARTITION_EOF:
-                empty_polls += 1
+        empty_polls = 0
+        for msg in batch:
+            if msg.error():
+                if msg.error().code() != KafkaError._PARTITION_EOF:
+                    log.error("✗ Consumer error: %s", msg.error())
                 continue
-            print_error(f"Consumer error: {msg.error()}")
-            continue
 
-        empty_polls = 0
-        try:
-            value = json.loads(msg.value().decode('utf-8'))
-            messages.append(value)
-        except json.JSONDecodeError:
-            print(f"  Warning: Could not parse message as JSON")
+            raw_payloads.put(msg.value())
+
+    # One sentinel per worker, then wait for the queue to drain
+    for _ in workers:
+        raw_payloads.put(None)
+    for worker in workers:
+        worker.join()
 
     consumer.close()
     return messages
 
 
+def start_tool_containers() -> None:
+    """Start long-lived kafka-cli and kafka-backup helper containers.
+
+    `docker compose run --rm` pays ~1-2s of container startup per command;
+    starting each tool container once and `docker exec`-ing into it makes
+    the individual backup/CLI calls near-instant. Both containers idle on
+    `sleep infinity` (the kafka-backup image's entrypoint is the backup
+    binary itself, so it is replaced for the idle container).
+    """
+    subprocess.run(
+        ["docker", "compose", "--profile", "tools", "run", "-d", "--rm",
+         "--name", KAFKA_CLI_CONTAINER, "kafka-cli", "sleep", "infinity"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    subprocess.run(
+        ["docker", "compose", "--profile", "tools", "run", "-d", "--rm",
+         "--name", KAFKA_BACKUP_CONTAINER, "--entrypoint", "sleep",
+         "kafka-backup", "infinity"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def stop_tool_containers() -> None:
+    """Tear down the helper containers started by start_tool_containers."""
+    subprocess.run(
+        ["docker", "rm", "-f", KAFKA_CLI_CONTAINER, KAFKA_BACKUP_CONTAINER],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
 def run_kafka_backup_command(args: List[str], description: str) -> bool:
-    """Run a kafka-backup command via docker compose."""
-    cmd = [
-        "docker", "compose", "--profile", "tools",
-        "run", "--rm", "kafka-backup"
-    ] + args
+    """Run a kafka-backup command in the long-lived helper container.
+
+    Output is streamed line-by-line rather than buffered whole with
+    capture_output, so peak memory stays O(1) for long backup jobs and
+    errors show up as they happen; only the first 500 characters are
+    echoed, the rest is drained and discarded.
+    """
+    cmd = ["docker", "exec", KAFKA_BACKUP_CONTAINER, "kafka-backup"] + args
 
     print(f"Running: {' '.join(cmd)}")
 
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=120
+            bufsize=1
         )
+        # The read loop has no deadline of its own: a job that stalls while
+        # keeping its pipe open would block it forever. The timer enforces
+        # the same 120s wall-clock limit the old subprocess.run(timeout=120)
+        # call had, killing the process so the loop sees EOF.
+        timed_out = threading.Event()
+
+        def kill_on_timeout():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(120, kill_on_timeout)
+        timer.start()
+        try:
+            shown = 0
+            for line in proc.stdout:
+                if shown < 500:
+                    sys.stdout.write(line)
+                    shown += len(line)
+            returncode = proc.wait(timeout=120)
+        finally:
+            timer.cancel()
+
+        if timed_out.is_set():
+            print_error(f"Command timed out: {description}")
+            return False
 
-        if result.returncode == 0:
+        if returncode == 0:
             print_success(description)
-            if result.stdout:
-                print(result.stdout[:500])  # Limit output
             return True
         else:
             print_error(f"{description} failed")
-            if result.stderr:
-                print(result.stderr[:500])
             return False
 
     except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()  # reap the killed process
         print_error(f"Command timed out: {description}")
         return False
     except Exception as e:
@@ -162,17 +314,17 @@ def run_kafka_backup_command(args: List[str], description: str) -> bool:
 
 
 def run_kafka_cli_command(cmd: str, description: str) -> bool:
-    """Run a Kafka CLI command via docker compose."""
-    full_cmd = [
-        "docker", "compose", "--profile", "tools",
-        "run", "--rm", "kafka-cli",
-        "bash", "-c", cmd
-    ]
+    """Run a Kafka CLI command in the long-lived helper container."""
+    full_cmd = ["docker", "exec", KAFKA_CLI_CONTAINER, "bash", "-c", cmd]
 
     try:
+        # stdout is never read on the success path, so discard it at the OS
+        # level instead of paying for a pipe and a decode; stderr is kept
+        # for error reporting.
         result = subprocess.run(
             full_cmd,
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True,
             timeout=60
         )
@@ -189,52 +341,61 @@ def run_kafka_cli_command(cmd: str, description: str) -> bool:
         return False
 
 
-def generate_test_messages(count: int) -> List[Dict[str, Any]]:
-    """Generate test order messages."""
-    import random
-    messages = []
+PRODUCTS = ('Widget', 'Gadget', 'Device', 'Tool')
 
-    for i in range(1, count + 1):
-        messages.append({
-            'order_id': f'PY-ORD-{i:04d}',
-            'customer_id': f'CUST-{random.randint(1, 100):03d}',
-            'product': random.choice(['Widget', 'Gadget', 'Device', 'Tool']),
-            'amount': round(random.uniform(10.0, 1000.0), 2),
-            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-        })
 
-    return messages
+def generate_test_messages(count: int) -> List[Order]:
+    """Generate test order messages.
 
+    The random columns are drawn as NumPy arrays in one vectorized pass
+    (customer ids, product picks, amounts) rather than one random call
+    per row, then zipped into Order structs at the end.
+    """
+    import numpy as np
+    rng = np.random.default_rng()
 
-def compare_messages(original: List[Dict], restored: List[Dict]) -> bool:
-    """Compare original and restored messages."""
-    if len(original) != len(restored):
-        print_error(f"Message count mismatch: {len(original)} vs {len(restored)}")
-        return False
+    customers = rng.integers(1, 101, count)
+    product_idx = rng.integers(0, len(PRODUCTS), count)
+    amounts = np.round(rng.uniform(10.0, 1000.0, count), 2)
+    # All messages are created back-to-back, so one timestamp serves the
+    # whole batch.
+    ts = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
 
-    # Sort by order_id for comparison
-    original_sorted = sorted(original, key=lambda x: x['order_id'])
-    restored_sorted = sorted(restored, key=lambda x: x['order_id'])
-
-    mismatches = 0
-    for orig, rest in zip(original_sorted, restored_sorted):
-        # Compare key fields
-        if orig['order_id'] != rest['order_id']:
-            print(f"  Mismatch: {orig['order_id']} != {rest['order_id']}")
-            mismatches += 1
-        elif orig['amount'] != rest['amount']:
-            print(f"  Amount mismatch for {orig['order_id']}")
-            mismatches += 1
-
-    if mismatches == 0:
+    return [
+        Order(
+            order_id=f'PY-ORD-{i:04d}',
+            customer_id=f'CUST-{c:03d}',
+            product=PRODUCTS[p],
+            amount=float(a),
+            timestamp=ts
+        )
+        for i, c, p, a in zip(range(1, count + 1), customers, product_idx, amounts)
+    ]
+
+
+def compare_messages(original: List[Order], restored: List[OrderSubset]) -> bool:
+    """Compare original and restored messages."""
+    # Two O(n) set builds plus a C-level symmetric difference replace any
+    # per-message Python comparison loop; an entry survives the diff only
+    # if it is missing from, changed on, or extra on one side.
+    original_set = {(o.order_id, o.amount) for o in original}
+    restored_set = {(r.order_id, r.amount) for r in restored}
+    diff = original_set ^ restored_set
+
+    if not diff and len(original) == len(restored):
         print_success(f"All {len(original)} messages match!")
         return True
-    else:
-        print_error(f"{mismatches} mismatches found")
-        return False
+
+    if len(original) != len(restored):
+        print_error(f"Message count mismatch: {len(original)} vs {len(restored)}")
+    for order_id, _ in sorted(diff):
+        print(f"  Mismatch for {order_id}")
+    if diff:
+        print_error(f"{len(diff)} mismatched entries found")
+    return False
 
 
-def main():
+async def main():
     parser = argparse.ArgumentParser(description='Python Kafka Backup/Restore Demo')
     parser.add_argument('--bootstrap-servers', default='localhost:9092',
                         help='Kafka bootstrap servers')
@@ -242,6 +403,8 @@ def main():
                         help='Number of messages to produce')
     args = parser.parse_args()
 
+    logging.basicConfig(format='%(message)s', level=logging.INFO)
+
     print("=" * 60)
     print("  Python Backup & Restore Demo")
     print("=" * 60)
@@ -250,16 +413,26 @@ def main():
     print(f"  Message count: {args.messages}")
     print()
 
+    # Kick off the helper containers in a worker thread; every later
+    # backup/CLI call is a fast `docker exec` against them. The startup
+    # overlaps with message generation and produce below, since all three
+    # are I/O waits. atexit covers the early sys.exit() paths too.
+    prewarm_containers = asyncio.create_task(asyncio.to_thread(start_tool_containers))
+    atexit.register(stop_tool_containers)
+
     # Step 1: Generate test messages
     print_step(1, "Generating test messages")
     original_messages = generate_test_messages(args.messages)
     print_success(f"Generated {len(original_messages)} test messages")
     print(f"  Sample: {original_messages[0]}")
 
-    # Step 2: Produce messages
+    # Step 2: Produce messages (concurrently with container startup)
     print_step(2, "Producing messages to Kafka")
     producer = create_producer(args.bootstrap_servers)
-    produce_messages(producer, original_messages)
+    await asyncio.gather(
+        asyncio.to_thread(produce_messages, producer, original_messages),
+        prewarm_containers,
+    )
 
     # Step 3: Run backup
     print_step(3, "Running kafka-backup")
@@ -294,7 +467,8 @@ backup:
     with open('/tmp/python-backup.yaml', 'w') as f:
         f.write(backup_config)
 
-    success = run_kafka_backup_command(
+    success = await asyncio.to_thread(
+        run_kafka_backup_command,
         ['backup', '--config', '/config/backup-basic.yaml'],
         "Backup completed"
     )
@@ -305,23 +479,26 @@ backup:
 
     # Step 4: Delete topic
     print_step(4, "Deleting topic (simulating data loss)")
-    run_kafka_cli_command(
+    await asyncio.to_thread(
+        run_kafka_cli_command,
         f"kafka-topics.sh --bootstrap-server kafka-broker-1:9092 --delete --topic {TOPIC}",
         "Topic deleted"
     )
-    time.sleep(3)
+    await asyncio.sleep(3)
 
     # Step 5: Recreate topic
     print_step(5, "Recreating empty topic")
-    run_kafka_cli_command(
+    await asyncio.to_thread(
+        run_kafka_cli_command,
         f"kafka-topics.sh --bootstrap-server kafka-broker-1:9092 --create --topic {TOPIC} --partitions 3 --replication-factor 1",
         "Topic recreated"
     )
-    time.sleep(2)
+    await asyncio.sleep(2)
 
     # Step 6: Restore
     print_step(6, "Restoring from backup")
-    success = run_kafka_backup_command(
+    success = await asyncio.to_thread(
+        run_kafka_backup_command,
         ['restore', '--config', '/config/restore-basic.yaml'],
         "Restore completed"
     )
@@ -330,12 +507,12 @@ backup:
         print_error("Restore failed, exiting")
         sys.exit(1)
 
-    time.sleep(2)
+    await asyncio.sleep(2)
 
     # Step 7: Consume and compare
     print_step(7, "Consuming and comparing messages")
     consumer = create_consumer(args.bootstrap_servers, 'python-verify-group')
-    restored_messages = consume_messages(consumer)
+    restored_messages = await asyncio.to_thread(consume_messages, consumer)
     print(f"  Consumed {len(restored_messages)} messages")
 
     # Step 8: Validate
@@ -365,4 +542,4 @@ Key Takeaways:
 
 
 if __name__ == '__main__':
-    main()
+    asyncio.run(main())